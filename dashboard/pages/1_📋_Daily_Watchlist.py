@@ -6,6 +6,8 @@ Shows current setups across all enabled strategies
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
@@ -17,6 +19,7 @@ sys.path.append(str(PROJECT_ROOT))
 from config.config import UNIVERSES
 from config.strategy_registry import STRATEGY_REGISTRY, get_enabled_strategies
 from scripts.data_management.fetch_data import load_data
+from scripts.data_management.parquet_store import load_parquet, load_universe
 
 # Import strategy classes
 from strategies.ma101_strategy import MA101Strategy
@@ -40,6 +43,135 @@ STRATEGY_CLASSES = {
     'qullamaggie_htf': QullamaggieHTFStrategy
 }
 
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_load(symbol):
+    """Load OHLC history once per hour; reruns are served from memory"""
+    # Prefer the columnar Parquet copy, fall back to the original loader
+    df = load_parquet(symbol)
+    return df if df is not None else load_data(symbol)
+
+
+@st.cache_resource
+def _get_strategy(strategy_id):
+    """Shared strategy instance (strategies hold no per-symbol state)"""
+    return STRATEGY_CLASSES[strategy_id]()
+
+
+# Fields kept from each strategy's signal dict (missing ones become NaN)
+SIGNAL_COLUMNS = [
+    'symbol', 'date', 'signal', 'entry_price', 'stop_price', 'risk_per_share',
+    'strategy', 'strategy_id', 'reason', 'atr', 'volume_ratio'
+]
+
+# Rows rendered in the signals table (full list available as CSV)
+MAX_TABLE_ROWS = 200
+
+# Worker threads for loading the universe (I/O + parsing, which releases the GIL)
+SCAN_WORKERS = 16
+
+
+def load_symbol(symbol, df=None):
+    """
+    Load one symbol's history for the scan
+    
+    Runs in a worker thread, so it must not touch Streamlit elements.
+    
+    Args:
+        symbol: Ticker symbol
+        df: Already-loaded history (e.g. from the master Parquet file)
+    
+    Returns:
+        DataFrame tagged with its symbol, or None if unusable
+    """
+    try:
+        # Load data (st.cache_data hands back a fresh copy each call)
+        if df is None:
+            df = _cached_load(symbol)
+        
+        if df.empty or len(df) < 200:
+            return None
+        
+        df['symbol'] = symbol
+        return df
+    
+    except Exception as e:
+        # Silently skip symbol errors (including loaders that return None)
+        return None
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def run_scan(universe, strategy_ids, min_risk, max_risk):
+    """
+    Scan a universe with the selected strategies
+    
+    The result only depends on the arguments, so repeat scans within the
+    TTL are served from the cache (`strategy_ids` must be a tuple to be
+    hashable). No st.* calls in here: elements created or updated inside a
+    cached function are replayed on cache hits, which fails for elements
+    that live outside it (like a progress bar).
+    
+    Returns:
+        DataFrame of signals that pass the risk filter
+    """
+    symbols = UNIVERSES.get(universe, ['SPY', 'QQQ', 'IWM'])
+    
+    # Collect all signals column by column, so the DataFrame is built
+    # in one pass at the end
+    columns = {col: [] for col in SIGNAL_COLUMNS}
+    
+    # Instantiate each selected strategy once, before touching any data
+    active = {}
+    for strategy_id in strategy_ids:
+        if strategy_id not in STRATEGY_CLASSES:
+            continue
+        
+        try:
+            active[strategy_id] = _get_strategy(strategy_id)
+        except Exception as e:
+            # Silently skip strategies that fail to load
+            continue
+    
+    if not active:
+        return pd.DataFrame(columns)
+    
+    # Symbols in the master Parquet file come back in a single read
+    try:
+        preloaded = load_universe(symbols)
+    except Exception as e:
+        preloaded = {}
+    
+    # Fan the remaining symbol loads out to worker threads
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(symbols))) as executor:
+        futures = {
+            executor.submit(load_symbol, symbol, preloaded.get(symbol)): symbol
+            for symbol in symbols
+        }
+        
+        loaded = {}
+        for future in as_completed(futures):
+            loaded[futures[future]] = future.result()
+    
+    # Keep universe order regardless of completion order
+    data_dict = {symbol: loaded[symbol] for symbol in symbols if loaded[symbol] is not None}
+    
+    # Run each selected strategy across the whole universe at once
+    for strategy_id, strategy in active.items():
+        try:
+            for signal in strategy.check_batch(data_dict):
+                # Apply filters
+                if min_risk <= signal['risk_per_share'] <= max_risk:
+                    signal['strategy_id'] = strategy_id
+                    for col in SIGNAL_COLUMNS:
+                        columns[col].append(signal.get(col, np.nan))
+        
+        except Exception as e:
+            # Silently skip strategy errors
+            continue
+    
+    return pd.DataFrame(columns)
+
+
 # Sidebar filters
 with st.sidebar:
     st.header("⚙️ Filters")
@@ -81,79 +213,39 @@ if scan_button or 'last_scan' not in st.session_state:
             st.warning(f"No symbols in universe: {selected_universe}")
             st.stop()
         
-        # Collect all signals
-        all_signals = []
+        # Cached on (universe, strategies, risk filters)
+        signals_df = run_scan(
+            selected_universe,
+            tuple(selected_strategies),
+            min_risk,
+            max_risk
+        )
         
-        # Progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for idx, symbol in enumerate(symbols):
-            status_text.text(f"Scanning {symbol}... ({idx+1}/{len(symbols)})")
-            progress_bar.progress((idx + 1) / len(symbols))
-            
-            try:
-                # Load data
-                df = load_data(symbol)
-                
-                if df.empty or len(df) < 200:
-                    continue
-                
-                df['symbol'] = symbol
-                
-                # Run each selected strategy
-                for strategy_id in selected_strategies:
-                    if strategy_id not in STRATEGY_CLASSES:
-                        continue
-                    
-                    try:
-                        # Instantiate strategy
-                        StrategyClass = STRATEGY_CLASSES[strategy_id]
-                        strategy = StrategyClass()
-                        
-                        # Check for signal
-                        signal = strategy.check_current_signal(df)
-                        
-                        if signal:
-                            # Apply filters
-                            if min_risk <= signal['risk_per_share'] <= max_risk:
-                                signal['strategy_id'] = strategy_id
-                                all_signals.append(signal)
-                    
-                    except Exception as e:
-                        # Silently skip strategy errors
-                        continue
-            
-            except Exception as e:
-                # Silently skip symbol errors
-                continue
-        
-        progress_bar.empty()
-        status_text.empty()
-        
-        # Store results in session state
-        st.session_state['last_scan'] = all_signals
+        # Store results in session state, along with the risk array the
+        # views below work on
+        st.session_state['last_scan'] = signals_df
+        st.session_state['risks'] = signals_df['risk_per_share'].to_numpy(dtype=float)
         st.session_state['scan_time'] = datetime.now()
 
 # Display results
 if 'last_scan' in st.session_state:
-    signals = st.session_state['last_scan']
+    signals_df = st.session_state['last_scan']
+    risks = st.session_state['risks']
     scan_time = st.session_state.get('scan_time', datetime.now())
     
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Signals", len(signals))
+        st.metric("Total Signals", len(risks))
     
     with col2:
-        unique_symbols = len(set(s['symbol'] for s in signals))
+        unique_symbols = signals_df['symbol'].nunique() if len(risks) else 0
         st.metric("Unique Symbols", unique_symbols)
     
     with col3:
-        if signals:
-            avg_risk = sum(s['risk_per_share'] for s in signals) / len(signals)
-            st.metric("Avg Risk/Share", f"${avg_risk:.2f}")
+        if len(risks):
+            st.metric("Avg Risk/Share", f"${risks.mean():.2f}")
         else:
             st.metric("Avg Risk/Share", "—")
     
@@ -164,46 +256,61 @@ if 'last_scan' in st.session_state:
     st.markdown("---")
     
     # Display signals
-    if signals:
-        # Convert to DataFrame for display
-        signals_df = pd.DataFrame(signals)
-        
+    if len(signals_df):
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(["📊 Table View", "📈 By Strategy", "💰 By Risk"])
         
         with tab1:
             st.subheader("All Signals")
             
-            # Format for display
+            # Format for display (prices stay numeric; column_config
+            # formats them in the browser instead of per-cell f-strings)
             display_df = pd.DataFrame({
                 'Symbol': signals_df['symbol'],
                 'Strategy': signals_df['strategy_id'].map(
                     lambda x: STRATEGY_REGISTRY[x]['name'] if x in STRATEGY_REGISTRY else x
                 ),
                 'Signal': signals_df['signal'],
-                'Entry': signals_df['entry_price'].map(lambda x: f"${x:.2f}"),
-                'Stop': signals_df['stop_price'].map(lambda x: f"${x:.2f}"),
-                'Risk/Share': signals_df['risk_per_share'].map(lambda x: f"${x:.2f}"),
+                'Entry': signals_df['entry_price'],
+                'Stop': signals_df['stop_price'],
+                'Risk/Share': signals_df['risk_per_share'],
                 'Reason': signals_df['reason']
             })
             
-            # Make rows clickable for details
+            # Cap rendered rows so large universes don't stall the browser
             selected_row = st.dataframe(
-                display_df,
+                display_df.head(MAX_TABLE_ROWS),
+                column_config={
+                    'Entry': st.column_config.NumberColumn(format="$%.2f"),
+                    'Stop': st.column_config.NumberColumn(format="$%.2f"),
+                    'Risk/Share': st.column_config.NumberColumn(format="$%.2f")
+                },
+                height=600,
                 use_container_width=True,
                 hide_index=True
             )
             
+            if len(display_df) > MAX_TABLE_ROWS:
+                st.caption(f"Showing first {MAX_TABLE_ROWS} of {len(display_df)} signals")
+            
+            st.download_button(
+                "⬇️ Download all signals (CSV)",
+                display_df.to_csv(index=False).encode(),
+                file_name="signals.csv",
+                mime="text/csv"
+            )
+            
             # Show detailed signal on click
             if st.checkbox("Show signal details"):
+                labels = (signals_df['symbol'] + ' - ' + signals_df['strategy']).tolist()
                 selected_idx = st.selectbox(
                     "Select signal to view details:",
-                    range(len(signals)),
-                    format_func=lambda i: f"{signals[i]['symbol']} - {signals[i]['strategy']}"
+                    range(len(labels)),
+                    format_func=lambda i: labels[i]
                 )
                 
                 if selected_idx is not None:
-                    sig = signals[selected_idx]
+                    sig = signals_df.iloc[selected_idx]
                     
                     st.markdown("### Signal Details")
                     
@@ -218,9 +325,9 @@ if 'last_scan' in st.session_state:
                     
                     with col2:
                         st.markdown(f"**Risk/Share:** ${sig['risk_per_share']:.2f}")
-                        if 'atr' in sig:
+                        if pd.notna(sig['atr']):
                             st.markdown(f"**ATR:** ${sig['atr']:.2f}")
-                        if 'volume_ratio' in sig:
+                        if pd.notna(sig['volume_ratio']):
                             st.markdown(f"**Volume Ratio:** {sig['volume_ratio']:.1f}x")
                         st.markdown(f"**Date:** {sig['date']}")
                     
@@ -236,24 +343,32 @@ if 'last_scan' in st.session_state:
                 strategy_name = STRATEGY_REGISTRY.get(strategy_id, {}).get('name', strategy_id)
                 
                 with st.expander(f"**{strategy_name}** ({len(group)} signals)", expanded=True):
-                    for _, sig in group.iterrows():
-                        cols = st.columns([2, 2, 2, 2, 4])
-                        cols[0].markdown(f"**{sig['symbol']}**")
-                        cols[1].markdown(f"${sig['entry_price']:.2f}")
-                        cols[2].markdown(f"${sig['stop_price']:.2f}")
-                        cols[3].markdown(f"${sig['risk_per_share']:.2f}")
-                        cols[4].markdown(f"_{sig['reason']}_")
+                    # One table per strategy instead of a column layout per row
+                    st.dataframe(
+                        group[['symbol', 'entry_price', 'stop_price', 'risk_per_share', 'reason']],
+                        column_config={
+                            'symbol': 'Symbol',
+                            'entry_price': st.column_config.NumberColumn('Entry', format="$%.2f"),
+                            'stop_price': st.column_config.NumberColumn('Stop', format="$%.2f"),
+                            'risk_per_share': st.column_config.NumberColumn('Risk/Share', format="$%.2f"),
+                            'reason': 'Reason'
+                        },
+                        use_container_width=True,
+                        hide_index=True
+                    )
         
         with tab3:
             st.subheader("Signals by Risk Level")
             
-            # Sort by risk
-            sorted_signals = sorted(signals, key=lambda x: x['risk_per_share'])
+            # Sort by risk once, then split at the $1/$3 bucket edges
+            order = np.argsort(risks, kind='stable')
+            sorted_signals = signals_df.iloc[order].to_dict('records')
+            lo, hi = np.searchsorted(risks[order], [1.0, 3.0])
             
             # Group into risk buckets
-            low_risk = [s for s in sorted_signals if s['risk_per_share'] < 1.0]
-            med_risk = [s for s in sorted_signals if 1.0 <= s['risk_per_share'] < 3.0]
-            high_risk = [s for s in sorted_signals if s['risk_per_share'] >= 3.0]
+            low_risk = sorted_signals[:lo]
+            med_risk = sorted_signals[lo:hi]
+            high_risk = sorted_signals[hi:]
             
             col1, col2, col3 = st.columns(3)
             
@@ -0,0 +1,184 @@
+"""
+Parquet Price Store - Columnar OHLCV storage
+
+Stores price history as snappy-compressed Parquet (float32 prices) instead
+of row-oriented CSV, so loads only decode the columns they need:
+- data/historical/{SYMBOL}.parquet: one file per symbol
+- data/historical/master.parquet: optional single file for whole-universe
+  loads, with a dictionary-encoded symbol column for filter push-down
+
+DataCache shares the loaded frames between strategies in one process.
+"""
+
+import threading
+
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # fall back to pandas' Parquet reader
+    pq = None
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+PARQUET_DIR = PROJECT_ROOT / 'data' / 'historical'
+MASTER_FILE = PARQUET_DIR / 'master.parquet'
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+PRICE_DTYPES = {'open': 'float32', 'high': 'float32', 'low': 'float32', 'close': 'float32'}
+
+
+def parquet_path(symbol):
+    """Path of a symbol's Parquet file"""
+    return PARQUET_DIR / f'{symbol}.parquet'
+
+
+def save_parquet(symbol, df):
+    """
+    Write a symbol's OHLCV history to Parquet
+
+    Args:
+        symbol: Ticker symbol
+        df: DataFrame with OHLCV columns, indexed by date
+    """
+    PARQUET_DIR.mkdir(parents=True, exist_ok=True)
+    df[OHLCV_COLUMNS].astype(PRICE_DTYPES).to_parquet(
+        parquet_path(symbol), compression='snappy'
+    )
+
+
+def load_parquet(symbol):
+    """
+    Load a symbol's OHLCV history from Parquet
+
+    Returns:
+        DataFrame, or None if the symbol has not been converted yet
+    """
+    path = parquet_path(symbol)
+
+    if not path.exists():
+        return None
+
+    return pd.read_parquet(path, columns=OHLCV_COLUMNS)
+
+
+def save_master(data_dict):
+    """
+    Write many symbols to the single master Parquet file
+
+    Args:
+        data_dict: Dict of {symbol: DataFrame}
+    """
+    PARQUET_DIR.mkdir(parents=True, exist_ok=True)
+
+    frames = []
+    for symbol, df in data_dict.items():
+        frame = df[OHLCV_COLUMNS].astype(PRICE_DTYPES)
+        frame['symbol'] = symbol
+        frames.append(frame)
+
+    panel = pd.concat(frames)
+    panel['symbol'] = panel['symbol'].astype('category')
+    panel.to_parquet(MASTER_FILE, compression='snappy')
+
+
+def load_universe(symbols):
+    """
+    Load many symbols from the master Parquet file in one read
+
+    The symbol filter is pushed down to the Parquet reader, so row groups
+    for other symbols are never decoded.
+
+    Returns:
+        Dict of {symbol: DataFrame} for the symbols found (empty if no
+        master file exists)
+    """
+    if not MASTER_FILE.exists():
+        return {}
+
+    panel = pd.read_parquet(
+        MASTER_FILE,
+        columns=OHLCV_COLUMNS + ['symbol'],
+        filters=[('symbol', 'in', list(symbols))]
+    )
+
+    return {
+        symbol: frame.drop(columns='symbol')
+        for symbol, frame in panel.groupby('symbol', observed=True, sort=False)
+    }
+
+
+class DataCache:
+    """
+    OHLCV frames loaded once and shared by every strategy in a scan
+    
+    Files are read through a memory map (so the raw bytes come from the OS
+    page cache) and each symbol is decoded once. Every caller gets the same
+    DataFrame, so strategies must treat the frames as read-only; the
+    strategies never modify their input.
+    """
+    
+    def __init__(self, fallback=None):
+        """
+        Args:
+            fallback: Optional callable(symbol) -> DataFrame for symbols
+                without a Parquet file (e.g. the CSV loader)
+        """
+        self.fallback = fallback
+        self._frames = {}
+        self._lock = threading.Lock()
+    
+    def get(self, symbol):
+        """
+        Shared DataFrame for a symbol
+        
+        Returns:
+            DataFrame, or None if the symbol can't be loaded
+        """
+        with self._lock:
+            if symbol in self._frames:
+                return self._frames[symbol]
+        
+        df = self._read(symbol)
+        
+        # Failed loads aren't cached, so a transient failure is retried
+        if df is None:
+            return None
+        
+        with self._lock:
+            # Another thread may have loaded it meanwhile: keep one copy
+            return self._frames.setdefault(symbol, df)
+    
+    def data_dict(self, symbols):
+        """Dict of {symbol: DataFrame} for the symbols that could be loaded"""
+        frames = {symbol: self.get(symbol) for symbol in symbols}
+        return {symbol: df for symbol, df in frames.items() if df is not None}
+    
+    def clear(self):
+        """Drop all cached frames"""
+        with self._lock:
+            self._frames.clear()
+    
+    def _read(self, symbol):
+        """Decode a symbol's history, preferring the memory-mapped Parquet file"""
+        path = parquet_path(symbol)
+        
+        if path.exists():
+            if pq is None:
+                return load_parquet(symbol)
+            
+            table = pq.read_table(
+                path, columns=OHLCV_COLUMNS, memory_map=True, use_pandas_metadata=True
+            )
+            # split_blocks avoids consolidating columns into a fresh 2D block;
+            # self_destruct frees each Arrow column as it is converted
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        
+        if self.fallback is None:
+            return None
+        
+        try:
+            return self.fallback(symbol)
+        except Exception:
+            return None
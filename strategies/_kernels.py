@@ -0,0 +1,215 @@
+"""
+Indicator Kernels - compiled loops for indicator recurrences
+
+Moving averages, EMAs, rolling extremes and Wilder smoothing are all O(1)
+per-bar recurrences. Pandas runs them through its generic window machinery
+and allocates a new Series per step; these kernels run them as tight
+Numba-compiled loops over numpy arrays. They release the GIL, so callers
+may run them from several threads.
+
+Numba is a hard requirement (listed in the README's requirements.txt): run
+uncompiled, these loops would be slower than the pandas code they replace.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def ewm_alpha(x, alpha):
+    """
+    Exponentially weighted mean, matching pandas ewm(alpha=alpha, adjust=False)
+
+    Starts at the first valid input; across NaN gaps the previous value
+    carries forward and is decayed once per missing bar, as pandas does.
+    No fastmath: it would drop the NaN checks.
+    """
+    out = np.empty_like(x)
+    beta = 1.0 - alpha
+    prev = np.nan
+    old_weight = 1.0
+
+    for i in range(x.size):
+        value = x[i]
+        if np.isnan(prev):
+            prev = value
+        elif np.isnan(value):
+            old_weight *= beta
+        elif old_weight == 1.0:
+            # No gap since the last valid bar: plain multiply-add
+            prev = beta * prev + alpha * value
+        else:
+            # Reweight the stale value after a gap
+            old_weight *= beta
+            prev = (old_weight * prev + alpha * value) / (old_weight + alpha)
+            old_weight = 1.0
+        out[i] = prev
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ema(x, span):
+    """Exponential moving average, matching pandas ewm(span=span, adjust=False)"""
+    return ewm_alpha(x, 2.0 / (span + 1.0))
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x, window):
+    """
+    Simple moving average, matching pandas rolling(window).mean()
+
+    Keeps a running (Kahan-compensated) sum, adding the newest value and
+    subtracting the one leaving the window, so each bar costs O(1).
+    Windows containing a NaN are NaN.
+    """
+    out = np.full(x.size, np.nan)
+    total = 0.0
+    compensation = 0.0
+    nan_count = 0
+
+    for i in range(x.size):
+        value = x[i]
+        if np.isnan(value):
+            nan_count += 1
+        else:
+            y = value - compensation
+            t = total + y
+            compensation = (t - total) - y
+            total = t
+
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                y = -old - compensation
+                t = total + y
+                compensation = (t - total) - y
+                total = t
+
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_extreme(x, window, find_max):
+    """Monotonic-deque rolling max/min; windows containing a NaN are NaN"""
+    out = np.full(x.size, np.nan)
+    queue = np.empty(x.size, dtype=np.int64)
+    head = 0
+    tail = 0
+    last_nan = -1
+
+    for i in range(x.size):
+        value = x[i]
+        if np.isnan(value):
+            last_nan = i
+        else:
+            # Drop candidates the new value dominates
+            while tail > head and (
+                (find_max and x[queue[tail - 1]] <= value) or
+                (not find_max and x[queue[tail - 1]] >= value)
+            ):
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+
+        # Drop candidates that left the window
+        while tail > head and queue[head] <= i - window:
+            head += 1
+
+        if i >= window - 1 and last_nan <= i - window and tail > head:
+            out[i] = x[queue[head]]
+
+    return out
+
+
+def rolling_max(x, window):
+    """Rolling maximum, matching pandas rolling(window).max()"""
+    return _rolling_extreme(x, window, True)
+
+
+def rolling_min(x, window):
+    """Rolling minimum, matching pandas rolling(window).min()"""
+    return _rolling_extreme(x, window, False)
+
+
+@njit(cache=True, nogil=True)
+def rsi_wilder(x, period):
+    """
+    RSI with Wilder smoothing in a single pass
+
+    Seeds the average gain/loss with a simple mean over the first `period`
+    changes, then applies avg = (avg * (period - 1) + current) / period.
+    Values are NaN until the seed is complete. A change involving a NaN
+    close is skipped: that bar is NaN and the averages carry over it.
+    """
+    out = np.full(x.size, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    count = 0
+
+    for i in range(1, x.size):
+        change = x[i] - x[i - 1]
+        if np.isnan(change):
+            continue
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if count < period:
+            avg_gain += gain
+            avg_loss += loss
+            count += 1
+            if count < period:
+                continue
+            avg_gain /= period
+            avg_loss /= period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            out[i] = 100.0
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr_wilder(high, low, close, period):
+    """
+    Average True Range with Wilder smoothing in a single pass
+
+    The true range max(high - low, |high - prev close|, |low - prev close|)
+    is computed inline per bar, falling back to high - low where there is
+    no prior close. Seeds with the simple mean of the first `period` true
+    ranges, then applies atr = (atr * (period - 1) + tr) / period. Values
+    are NaN until the seed is complete. A bar with no true range (NaN high
+    or low) is skipped: it is NaN and the average carries over it.
+    """
+    out = np.full(high.size, np.nan)
+    avg = 0.0
+    count = 0
+
+    for i in range(high.size):
+        tr = high[i] - low[i]
+        if np.isnan(tr):
+            continue
+        if i > 0 and not np.isnan(close[i - 1]):
+            tr = max(tr, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+        if count < period:
+            avg += tr
+            count += 1
+            if count < period:
+                continue
+            avg /= period
+        else:
+            avg = (avg * (period - 1) + tr) / period
+        out[i] = avg
+
+    return out
@@ -11,10 +11,16 @@ import numpy as np
 import sys
 from pathlib import Path
 
+try:
+    import bottleneck as bn
+except ImportError:  # fall back to the compiled rolling kernels
+    bn = None
+
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from strategies.strategy_base import StrategyBase
+from strategies._kernels import rolling_max, rolling_min
 from strategies.strategy_definitions import STRATEGIES
 
 
@@ -41,31 +47,46 @@ class DonchianStrategy(StrategyBase):
     
     def calculate_indicators(self, df):
         """Calculate Donchian channels and ATR"""
-        df = df.copy()
+        # astype returns a new frame, so the caller's data is left untouched
+        df = self._to_float32(df)
+        out = {}
         
         # Donchian Channel High (highest high over N periods, excluding current bar)
-        df[f'donchian_high_{self.entry_period}'] = df['high'].shift(1).rolling(
-            window=self.entry_period
-        ).max()
+        out[f'donchian_high_{self.entry_period}'] = self._channel(df['high'], self.entry_period, 'max')
         
         # Donchian Channel Low (lowest low over N periods, excluding current bar)
-        df[f'donchian_low_{self.entry_period}'] = df['low'].shift(1).rolling(
-            window=self.entry_period
-        ).min()
+        out[f'donchian_low_{self.entry_period}'] = self._channel(df['low'], self.entry_period, 'min')
         
         # Exit channels (shorter period)
-        df[f'donchian_high_{self.exit_period}'] = df['high'].shift(1).rolling(
-            window=self.exit_period
-        ).max()
-        
-        df[f'donchian_low_{self.exit_period}'] = df['low'].shift(1).rolling(
-            window=self.exit_period
-        ).min()
+        out[f'donchian_high_{self.exit_period}'] = self._channel(df['high'], self.exit_period, 'max')
+        out[f'donchian_low_{self.exit_period}'] = self._channel(df['low'], self.exit_period, 'min')
         
         # ATR for optional stop
-        df[f'atr_{self.atr_period}'] = self._calculate_atr(df, self.atr_period)
+        out[f'atr_{self.atr_period}'] = self._atr(self._ohlcv(df), self.atr_period)
         
-        return df
+        # Attach all new columns at once
+        return df.assign(**out)
+    
+    def _channel(self, series, window, how):
+        """
+        Rolling max/min over the prior `window` bars (current bar excluded)
+        
+        Uses bottleneck's C moving-window kernels when installed, the
+        compiled deque kernels otherwise.
+        """
+        prior = series.shift(1).to_numpy()
+        
+        # bottleneck rejects windows longer than the series
+        if bn is not None and window <= len(prior):
+            move = bn.move_max if how == 'max' else bn.move_min
+            return move(prior, window=window, min_count=window)
+        
+        return (rolling_max if how == 'max' else rolling_min)(prior, window)
+    
+    def _lookback(self):
+        """Bars needed for the latest bar's indicators to match a full-history run"""
+        # Wilder's ATR (alpha = 1/period) needs ~10 periods to converge
+        return max(self.entry_period, self.exit_period, 10 * self.atr_period) + 5
     
     def generate_signals(self, df):
         """
@@ -76,72 +97,84 @@ class DonchianStrategy(StrategyBase):
         """
         df = self.calculate_indicators(df)
         
-        # Initialize signal columns
-        df['signal'] = 0
-        df['entry_price'] = np.nan
-        df['stop_price'] = np.nan
-        df['reason'] = ''
-        
         entry_high = f'donchian_high_{self.entry_period}'
         entry_low = f'donchian_low_{self.entry_period}'
         exit_low = f'donchian_low_{self.exit_period}'
         exit_high = f'donchian_high_{self.exit_period}'
         atr_col = f'atr_{self.atr_period}'
         
+        # Work on raw arrays and write each output column once
+        close = df['close'].to_numpy()
+        
         # Long entries: breakout above N-day high
-        long_breakout = df['close'] > df[entry_high]
+        long_breakout = close > df[entry_high].to_numpy()
         
         # Calculate stop price
         if self.use_atr_stop:
             # ATR-based stop
-            stop_price = df['close'] - (self.atr_stop_multiple * df[atr_col])
+            stop_price = close - (self.atr_stop_multiple * df[atr_col].to_numpy())
         else:
             # Exit channel stop
-            stop_price = df[exit_low]
+            stop_price = df[exit_low].to_numpy()
         
         # Long signals
-        df.loc[long_breakout, 'signal'] = 1
-        df.loc[long_breakout, 'entry_price'] = df.loc[long_breakout, 'close']
-        df.loc[long_breakout, 'stop_price'] = stop_price[long_breakout]
-        df.loc[long_breakout, 'reason'] = f'{self.entry_period}-day breakout high'
+        signal = long_breakout.astype(np.int8)
+        entry = np.where(long_breakout, close, np.nan)
+        stop = np.where(long_breakout, stop_price, np.nan)
         
         # Short entries (optional)
         if self.allow_shorts:
-            short_breakout = df['close'] < df[entry_low]
+            short_breakout = close < df[entry_low].to_numpy()
             
             if self.use_atr_stop:
-                stop_price_short = df['close'] + (self.atr_stop_multiple * df[atr_col])
+                stop_price_short = close + (self.atr_stop_multiple * df[atr_col].to_numpy())
             else:
-                stop_price_short = df[exit_high]
+                stop_price_short = df[exit_high].to_numpy()
             
-            df.loc[short_breakout, 'signal'] = -1
-            df.loc[short_breakout, 'entry_price'] = df.loc[short_breakout, 'close']
-            df.loc[short_breakout, 'stop_price'] = stop_price_short[short_breakout]
-            df.loc[short_breakout, 'reason'] = f'{self.entry_period}-day breakdown low'
+            signal[short_breakout] = -1
+            entry = np.where(short_breakout, close, entry)
+            stop = np.where(short_breakout, stop_price_short, stop)
+        
+        df['signal'] = signal
+        df['entry_price'] = entry
+        df['stop_price'] = stop
+        
+        # Reason text is only built for the bars that actually signal
+        reason = np.full(len(df), '', dtype=object)
+        reason[signal == 1] = f'{self.entry_period}-day breakout high'
+        reason[signal == -1] = f'{self.entry_period}-day breakdown low'
+        df['reason'] = reason
         
         return df
     
     def check_current_signal(self, df):
         """Check for signal on most recent bar"""
-        df = self.generate_signals(df)
+        # Channels and ATR only look back a fixed number of bars
+        df = self.generate_signals(df.iloc[-self._lookback():])
         
         if df.empty:
             return None
         
-        latest = df.iloc[-1]
+        # Read the last bar straight from the column arrays instead of
+        # materializing a row Series
+        signal = df['signal'].to_numpy()[-1]
         
-        if latest['signal'] != 0:
-            signal_type = 'LONG' if latest['signal'] == 1 else 'SHORT'
+        if signal != 0:
+            signal_type = 'LONG' if signal == 1 else 'SHORT'
+            entry_price = df['entry_price'].to_numpy()[-1]
+            stop_price = df['stop_price'].to_numpy()[-1]
+            atr_col = f'atr_{self.atr_period}'
+            
             return {
-                'symbol': latest.get('symbol', 'Unknown'),
-                'date': latest.name,
+                'symbol': df['symbol'].iat[0] if 'symbol' in df else 'Unknown',
+                'date': df.index[-1],
                 'signal': signal_type,
-                'entry_price': latest['entry_price'],
-                'stop_price': latest['stop_price'],
-                'reason': latest['reason'],
+                'entry_price': entry_price,
+                'stop_price': stop_price,
+                'reason': df['reason'].to_numpy()[-1],
                 'strategy': self.name,
-                'risk_per_share': abs(latest['entry_price'] - latest['stop_price']),
-                'atr': latest.get(f'atr_{self.atr_period}', 0),
+                'risk_per_share': abs(entry_price - stop_price),
+                'atr': df[atr_col].to_numpy()[-1] if atr_col in df else 0,
                 'parameters': {
                     'entry_period': self.entry_period,
                     'exit_period': self.exit_period,
@@ -150,6 +183,67 @@ class DonchianStrategy(StrategyBase):
             }
         
         return None
+    
+    def check_batch(self, data_dict):
+        """
+        Screen many symbols for breakouts in one numpy pass
+        
+        Stacks the trailing entry-channel window of every symbol into 2D
+        arrays and compares each latest close to the prior N-bar high/low.
+        Only symbols that break out go through the full check_current_signal
+        for stops and ATR. A symbol whose data can't be processed is skipped
+        without affecting the others.
+        
+        Args:
+            data_dict: Dict of {symbol: DataFrame}
+            
+        Returns:
+            List of signals
+        """
+        window = self.entry_period + 1
+        symbols, highs, lows, closes = [], [], [], []
+        
+        for symbol, df in data_dict.items():
+            # Shorter histories can't fill the channel, so they never signal
+            if len(df) < window:
+                continue
+            
+            try:
+                high = df['high'].to_numpy(dtype=float)[-window:]
+                low = df['low'].to_numpy(dtype=float)[-window:]
+                close = df['close'].to_numpy(dtype=float)[-1]
+            except (KeyError, TypeError, ValueError):
+                continue
+            
+            symbols.append(symbol)
+            highs.append(high)
+            lows.append(low)
+            closes.append(close)
+        
+        if not symbols:
+            return []
+        
+        highs = np.vstack(highs)
+        lows = np.vstack(lows)
+        closes = np.array(closes)
+        
+        # Channel excludes the current bar (NaN anywhere -> no breakout)
+        triggered = closes > highs[:, :-1].max(axis=1)
+        if self.allow_shorts:
+            triggered |= closes < lows[:, :-1].min(axis=1)
+        
+        signals = []
+        
+        for symbol in np.asarray(symbols)[triggered]:
+            try:
+                signal = self.check_current_signal(data_dict[symbol])
+            except Exception:
+                continue
+            
+            if signal:
+                signals.append(signal)
+        
+        return signals
 
 
 # Example usage
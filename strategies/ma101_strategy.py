@@ -13,6 +13,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from strategies.strategy_base import StrategyBase
+from strategies._kernels import ema, rsi_wilder
 from strategies.strategy_definitions import STRATEGIES
 
 
@@ -39,21 +40,36 @@ class MA101Strategy(StrategyBase):
     
     def calculate_indicators(self, df):
         """Calculate all required indicators"""
-        df = df.copy()
+        # astype returns a new frame, so the caller's data is left untouched
+        df = self._to_float32(df)
+        out = {}
+        
+        bars = self._ohlcv(df)
+        close = bars.close
         
         # Moving averages
-        df[f'sma_{self.regime_ma}'] = df['close'].rolling(window=self.regime_ma).mean()
-        df[f'ema_{self.fast_ema}'] = df['close'].ewm(span=self.fast_ema, adjust=False).mean()
-        df[f'ema_{self.slow_ema}'] = df['close'].ewm(span=self.slow_ema, adjust=False).mean()
-        df[f'ema_{self.stop_ma}'] = df['close'].ewm(span=self.stop_ma, adjust=False).mean()
+        out[f'sma_{self.regime_ma}'] = self._sma(close, self.regime_ma)
+        
+        # stop_ma shares fast_ema's span by default: compute each span once
+        for span in {self.fast_ema, self.slow_ema, self.stop_ma}:
+            out[f'ema_{span}'] = ema(close, span)
         
-        # RSI
-        df[f'rsi_{self.rsi_period}'] = self._calculate_rsi(df['close'], self.rsi_period)
+        # RSI (Wilder smoothing)
+        out[f'rsi_{self.rsi_period}'] = rsi_wilder(close, self.rsi_period)
         
         # ATR for position sizing
-        df['atr_14'] = self._calculate_atr(df, 14)
+        out['atr_14'] = self._atr(bars, 14)
         
-        return df
+        # Attach all new columns at once
+        return df.assign(**out)
+    
+    def _lookback(self):
+        """Bars needed for the latest bar's indicators to match a full-history run"""
+        # EMAs need ~5 spans of history for the initial value to wash out,
+        # Wilder's RSI and ATR(14) (alpha = 1/period) ~10 periods
+        ema_warmup = 5 * max(self.fast_ema, self.slow_ema, self.stop_ma)
+        wilder_warmup = 10 * max(self.rsi_period, 14)
+        return max(self.regime_ma, ema_warmup, wilder_warmup) + 5
     
     def generate_signals(self, df):
         """
@@ -107,24 +123,28 @@ class MA101Strategy(StrategyBase):
         Returns:
             dict with signal info or None
         """
-        df = self.generate_signals(df)
+        # Only the latest bar is needed, so skip the full history
+        df = self.generate_signals(df.iloc[-self._lookback():])
         
         if df.empty:
             return None
         
-        latest = df.iloc[-1]
-        
-        if latest['signal'] == 1:
+        # Read the last bar straight from the column arrays instead of
+        # materializing a row Series
+        if df['signal'].to_numpy()[-1] == 1:
+            entry_price = df['entry_price'].to_numpy()[-1]
+            stop_price = df['stop_price'].to_numpy()[-1]
+            
             return {
-                'symbol': latest.get('symbol', 'Unknown'),
-                'date': latest.name,
+                'symbol': df['symbol'].iat[0] if 'symbol' in df else 'Unknown',
+                'date': df.index[-1],
                 'signal': 'LONG',
-                'entry_price': latest['entry_price'],
-                'stop_price': latest['stop_price'],
-                'reason': latest['reason'],
+                'entry_price': entry_price,
+                'stop_price': stop_price,
+                'reason': df['reason'].to_numpy()[-1],
                 'strategy': self.name,
-                'risk_per_share': latest['entry_price'] - latest['stop_price'],
-                'atr': latest.get('atr_14', 0)
+                'risk_per_share': entry_price - stop_price,
+                'atr': df['atr_14'].to_numpy()[-1] if 'atr_14' in df else 0
             }
         
         return None
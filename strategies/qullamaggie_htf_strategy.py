@@ -10,13 +10,35 @@ import numpy as np
 import sys
 from pathlib import Path
 
+try:
+    import numexpr as ne
+except ImportError:  # fall back to numpy boolean ops
+    ne = None
+
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from strategies.strategy_base import StrategyBase
+from strategies._kernels import ema, rolling_max, rolling_mean, rolling_min
 from strategies.strategy_definitions import STRATEGIES
 
 
+# HTF entry conditions, evaluated in one pass by QullamaggieHTFStrategy._htf_filter
+HTF_CONDITIONS = (
+    '(avg_dollar_volume >= min_dollar_volume)'    # FILTER 1: Liquidity (average dollar volume)
+    ' & (close > sma_50)'                         # FILTER 2: Above 50-day MA (in uptrend)
+    ' & (pole_move >= min_pole_move)'             # FILTER 3: Pole exists (strong prior move)
+    ' & (close >= high_20 * 0.90)'                # FILTER 4: Near highs (within 10% of 20-day high)
+    ' & (close >= ema_10) & (close >= sma_20)'    # FILTER 5: Tight consolidation (price above EMAs)
+    ' & (high > prior_high_20)'                   # ENTRY TRIGGER: Breakout of 20-day high
+    ' & (volume_ratio >= volume_multiplier)'      # ... with volume
+)
+
+# Column dtypes of the stacked panel in screen_universe_vectorized (prices
+# as in StrategyBase._to_float32; volume stays float64)
+PANEL_DTYPES = {'high': 'float32', 'low': 'float32', 'close': 'float32', 'volume': 'float64'}
+
+
 class QullamaggieHTFStrategy(StrategyBase):
     """
     High Tight Flag Pattern Strategy
@@ -30,6 +52,9 @@ class QullamaggieHTFStrategy(StrategyBase):
     Exit: Close below 10 EMA or 20 SMA
     """
     
+    # Categories of the reason column, indexed by signal code (0 = no signal)
+    REASONS = ['', 'HTF breakout: strong leader, pole+flag, volume']
+    
     def __init__(self, config=None):
         strategy_def = STRATEGIES['qullamaggie_plan_suite_202x']['sub_strategies']['HTF_high_tight_flag']
         super().__init__(strategy_def, config)
@@ -49,102 +74,141 @@ class QullamaggieHTFStrategy(StrategyBase):
     
     def calculate_indicators(self, df):
         """Calculate EMAs, volume metrics, and pattern detection"""
-        df = df.copy()
+        # astype returns a new frame, so the caller's data is left untouched
+        df = self._to_float32(df)
+        out = {}
+        bars = self._ohlcv(df)
+        close = bars.close
+        volume = bars.volume
         
         # Moving averages
-        df['ema_10'] = df['close'].ewm(span=self.ema_10, adjust=False).mean()
-        df['sma_20'] = df['close'].rolling(window=self.sma_20).mean()
-        df['sma_50'] = df['close'].rolling(window=self.ma_50).mean()
+        out['ema_10'] = ema(close, self.ema_10)
+        out['sma_20'] = self._sma(close, self.sma_20)
+        out['sma_50'] = self._sma(close, self.ma_50)
         
         # Volume metrics
-        df['avg_volume'] = df['volume'].rolling(window=self.volume_lookback).mean()
-        df['volume_ratio'] = df['volume'] / df['avg_volume']
+        out['avg_volume'] = rolling_mean(volume, self.volume_lookback)
+        out['volume_ratio'] = volume / out['avg_volume']
         
-        # Dollar volume (for liquidity filter)
-        df['dollar_volume'] = df['close'] * df['volume']
-        df['avg_dollar_volume'] = df['dollar_volume'].rolling(window=self.volume_lookback).mean()
+        # Average dollar volume (for liquidity filter); the per-bar product
+        # only feeds the rolling mean, so it isn't kept as a column
+        out['avg_dollar_volume'] = rolling_mean(close * volume, self.volume_lookback)
         
         # Pattern detection helpers
-        df['high_20'] = df['high'].rolling(window=20).max()
-        df['low_20'] = df['low'].rolling(window=20).min()
+        out['high_20'] = rolling_max(bars.high, 20)
+        out['low_20'] = rolling_min(bars.low, 20)
         
         # Pole detection: N-bar percentage change
-        df['pole_move'] = (df['close'] / df['close'].shift(self.pole_lookback)) - 1
+        lag = self.pole_lookback
+        out['pole_move'] = np.full(len(close), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['pole_move'][lag:] = close[lag:] / close[:-lag] - 1
         
-        return df
+        # Attach all new columns at once (assign leaves the caller's frame untouched)
+        return df.assign(**out)
+    
+    def _min_bars(self):
+        """Fewest bars on which every HTF filter is defined for the latest bar"""
+        return max(
+            self.ma_50,
+            self.volume_lookback,
+            self.pole_lookback + 1,  # close N bars back
+            20 + 1                   # prior bar's 20-day high
+        )
     
     def generate_signals(self, df):
         """Generate HTF breakout signals"""
+        # Too short for every filter to be defined: nothing can signal
+        if len(df) < self._min_bars():
+            return df.assign(
+                signal=np.zeros(len(df), dtype=np.int8),
+                entry_price=np.nan,
+                stop_price=np.nan,
+                reason=pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), self.REASONS)
+            )
+        
         df = self.calculate_indicators(df)
         
-        df['signal'] = 0
-        df['entry_price'] = np.nan
-        df['stop_price'] = np.nan
-        df['reason'] = ''
+        high_20 = df['high_20'].to_numpy()
+        prior_high_20 = np.full_like(high_20, np.nan)
+        prior_high_20[1:] = high_20[:-1]
         
-        # FILTER 1: Liquidity (average dollar volume)
-        liquidity_ok = df['avg_dollar_volume'] >= self.min_dollar_volume
+        htf_signal = self._htf_filter(
+            close=df['close'].to_numpy(),
+            high=df['high'].to_numpy(),
+            avg_dollar_volume=df['avg_dollar_volume'].to_numpy(),
+            sma_50=df['sma_50'].to_numpy(),
+            pole_move=df['pole_move'].to_numpy(),
+            high_20=high_20,
+            ema_10=df['ema_10'].to_numpy(),
+            sma_20=df['sma_20'].to_numpy(),
+            prior_high_20=prior_high_20,
+            volume_ratio=df['volume_ratio'].to_numpy()
+        )
         
-        # FILTER 2: Above 50-day MA (in uptrend)
-        above_50ma = df['close'] > df['sma_50']
+        # Write each output column once from the raw arrays
+        df['signal'] = htf_signal.astype(np.int8)
+        df['entry_price'] = np.where(htf_signal, df['high'].to_numpy(), np.nan)  # Buy breakout
+        df['stop_price'] = np.where(htf_signal, df['low'].to_numpy(), np.nan)  # Stop at day's low
+        df['reason'] = pd.Categorical.from_codes(htf_signal.astype(np.int8), self.REASONS)
         
-        # FILTER 3: Pole exists (strong prior move)
-        strong_pole = df['pole_move'] >= self.min_pole_move
+        return df
+    
+    def _htf_filter(self, **arrays):
+        """
+        Combine all HTF entry filters into one boolean array
         
-        # FILTER 4: Near highs (simplified - close within 10% of 20-day high)
-        near_highs = df['close'] >= (df['high_20'] * 0.90)
+        numexpr evaluates the whole expression in a single fused pass over
+        the inputs instead of materializing seven intermediate masks.
         
-        # FILTER 5: Tight consolidation (price between EMAs)
-        tight = (
-            (df['close'] >= df['ema_10']) &
-            (df['close'] >= df['sma_20'])
-        )
+        Args:
+            **arrays: Equal-length arrays named as in HTF_CONDITIONS
+        """
+        if ne is not None:
+            return ne.evaluate(HTF_CONDITIONS, local_dict={
+                **arrays,
+                'min_dollar_volume': self.min_dollar_volume,
+                'min_pole_move': self.min_pole_move,
+                'volume_multiplier': self.volume_breakout_multiplier
+            })
         
-        # ENTRY TRIGGER: Breakout of 20-day high with volume
-        breakout = df['high'] > df['high_20'].shift(1)
-        volume_confirmation = df['volume_ratio'] >= self.volume_breakout_multiplier
-        
-        # Combine all conditions
-        htf_signal = (
-            liquidity_ok &
-            above_50ma &
-            strong_pole &
-            near_highs &
-            tight &
-            breakout &
-            volume_confirmation
+        a = arrays
+        return (
+            (a['avg_dollar_volume'] >= self.min_dollar_volume) &
+            (a['close'] > a['sma_50']) &
+            (a['pole_move'] >= self.min_pole_move) &
+            (a['close'] >= a['high_20'] * 0.90) &
+            (a['close'] >= a['ema_10']) &
+            (a['close'] >= a['sma_20']) &
+            (a['high'] > a['prior_high_20']) &
+            (a['volume_ratio'] >= self.volume_breakout_multiplier)
         )
-        
-        df.loc[htf_signal, 'signal'] = 1
-        df.loc[htf_signal, 'entry_price'] = df.loc[htf_signal, 'high']  # Buy breakout
-        df.loc[htf_signal, 'stop_price'] = df.loc[htf_signal, 'low']  # Stop at day's low
-        df.loc[htf_signal, 'reason'] = 'HTF breakout: strong leader, pole+flag, volume'
-        
-        return df
     
-    def check_current_signal(self, df):
+    def check_current_signal(self, df, symbol=None):
         """Check for HTF signal on most recent bar"""
         df = self.generate_signals(df)
         
         if df.empty:
             return None
         
-        latest = df.iloc[-1]
-        
-        if latest['signal'] == 1:
-            pole_pct = latest.get('pole_move', 0) * 100
+        # Read the last bar straight from the column arrays instead of
+        # materializing a row Series
+        if df['signal'].to_numpy()[-1] == 1:
+            entry_price = df['entry_price'].to_numpy()[-1]
+            stop_price = df['stop_price'].to_numpy()[-1]
+            pole_pct = df['pole_move'].to_numpy()[-1] * 100
             
             return {
-                'symbol': latest.get('symbol', 'Unknown'),
-                'date': latest.name,
+                'symbol': symbol or (df['symbol'].iat[0] if 'symbol' in df else 'Unknown'),
+                'date': df.index[-1],
                 'signal': 'LONG',
-                'entry_price': latest['entry_price'],
-                'stop_price': latest['stop_price'],
-                'reason': latest['reason'],
+                'entry_price': entry_price,
+                'stop_price': stop_price,
+                'reason': df['reason'].iat[-1],
                 'strategy': self.name,
-                'risk_per_share': latest['entry_price'] - latest['stop_price'],
-                'volume_ratio': latest.get('volume_ratio', 1.0),
-                'dollar_volume': latest.get('avg_dollar_volume', 0),
+                'risk_per_share': entry_price - stop_price,
+                'volume_ratio': df['volume_ratio'].to_numpy()[-1],
+                'dollar_volume': df['avg_dollar_volume'].to_numpy()[-1],
                 'pole_move_pct': f"{pole_pct:.1f}%",
                 'pattern': 'High Tight Flag'
             }
@@ -167,20 +231,127 @@ class QullamaggieHTFStrategy(StrategyBase):
         for symbol in symbol_list:
             if symbol not in data_dict:
                 continue
-                
-            df = data_dict[symbol].copy()
-            df['symbol'] = symbol
             
-            signal = self.check_current_signal(df)
+            # The frame is passed through untouched, so a shared DataCache
+            # frame is never copied; a symbol that fails is skipped
+            try:
+                signal = self.check_current_signal(data_dict[symbol], symbol)
+            except Exception:
+                continue
             if signal:
                 signals.append(signal)
         
         return signals
+    
+    def screen_universe_vectorized(self, data_dict):
+        """
+        Screen many symbols for HTF setups in one pass over a stacked panel
+        
+        All symbols are concatenated into one (symbol, date) frame and each
+        indicator is a single grouped rolling/ewm call, instead of one
+        pandas pipeline per symbol. Filters are then evaluated on the last
+        bar of every symbol at once. Symbols whose data can't be used are
+        skipped, as in screen_universe.
+        
+        Args:
+            data_dict: Dict of {symbol: DataFrame}
+            
+        Returns:
+            List of signals
+        """
+        # Cast per symbol, so one bad frame can't fail the whole panel
+        frames = {}
+        for symbol, df in data_dict.items():
+            try:
+                frame = df[['high', 'low', 'close', 'volume']].astype(PANEL_DTYPES)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if len(frame):
+                frames[symbol] = frame
+        
+        if not frames:
+            return []
+        
+        panel = pd.concat(frames, names=['symbol', 'date'])
+        panel['dollar_volume'] = panel['close'] * panel['volume']
+        
+        # Groups keep panel order, so grouped results line up with its rows
+        groups = panel.groupby(level='symbol', sort=False)
+        
+        def rolling(column, window, how):
+            return getattr(groups[column].rolling(window), how)().to_numpy()
+        
+        ema_10 = groups['close'].ewm(span=self.ema_10, adjust=False).mean().to_numpy()
+        sma_20 = rolling('close', self.sma_20, 'mean')
+        sma_50 = rolling('close', self.ma_50, 'mean')
+        avg_volume = rolling('volume', self.volume_lookback, 'mean')
+        avg_dollar_volume = rolling('dollar_volume', self.volume_lookback, 'mean')
+        high_20 = rolling('high', 20, 'max')
+        
+        # Row of each symbol's last bar
+        sizes = groups.size().to_numpy()
+        last = np.cumsum(sizes) - 1
+        
+        high = panel['high'].to_numpy()
+        low = panel['low'].to_numpy()
+        close = panel['close'].to_numpy()
+        volume = panel['volume'].to_numpy()
+        
+        # Lagged values only exist inside the symbol's own history; rows are
+        # clipped into the panel first so short histories index safely, then masked
+        prior_row = np.maximum(last - 1, 0)
+        base_row = np.maximum(last - self.pole_lookback, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            prior_high_20 = np.where(sizes > 1, high_20[prior_row], np.nan)
+            base = np.where(sizes > self.pole_lookback, close[base_row], np.nan)
+            pole_move = close[last] / base - 1
+            volume_ratio = volume[last] / avg_volume[last]
+        
+        htf_signal = self._htf_filter(
+            close=close[last],
+            high=high[last],
+            avg_dollar_volume=avg_dollar_volume[last],
+            sma_50=sma_50[last],
+            pole_move=pole_move,
+            high_20=high_20[last],
+            ema_10=ema_10[last],
+            sma_20=sma_20[last],
+            prior_high_20=prior_high_20,
+            volume_ratio=volume_ratio
+        )
+        
+        symbols = groups.size().index
+        dates = panel.index.get_level_values('date')
+        signals = []
+        
+        for i in np.flatnonzero(htf_signal):
+            row = last[i]
+            signals.append({
+                'symbol': symbols[i],
+                'date': dates[row],
+                'signal': 'LONG',
+                'entry_price': high[row],
+                'stop_price': low[row],
+                'reason': self.REASONS[1],
+                'strategy': self.name,
+                'risk_per_share': high[row] - low[row],
+                'volume_ratio': volume_ratio[i],
+                'dollar_volume': avg_dollar_volume[row],
+                'pole_move_pct': f"{pole_move[i] * 100:.1f}%",
+                'pattern': 'High Tight Flag'
+            })
+        
+        return signals
+    
+    def check_batch(self, data_dict):
+        """Check the most recent bar of many symbols with one vectorized screen"""
+        return self.screen_universe_vectorized(data_dict)
 
 
 # Example usage
 if __name__ == "__main__":
     from scripts.data_management.fetch_data import load_data, fetch_historical_data
+    from scripts.data_management.parquet_store import DataCache
     
     # Test on a few high-volume stocks
     symbols = ['AAPL', 'TSLA', 'NVDA', 'AMD', 'MSFT']
@@ -190,14 +361,12 @@ if __name__ == "__main__":
     
     strategy = QullamaggieHTFStrategy()
     
-    # Load data for all symbols
-    data_dict = {}
+    # Load data for all symbols once; other strategies can share the cache
+    cache = DataCache(fallback=load_data)
+    data_dict = cache.data_dict(symbols)
     for symbol in symbols:
-        try:
-            data_dict[symbol] = load_data(symbol)
-        except:
+        if symbol not in data_dict:
             print(f"Could not load {symbol}")
-            continue
     
     # Screen for signals
     signals = strategy.screen_universe(symbols, data_dict)
@@ -8,6 +8,8 @@ All specific strategies inherit from this base.
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+from collections import namedtuple
+import re
 import sys
 from pathlib import Path
 
@@ -16,6 +18,16 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from config.config import RISK_CONFIG
+from strategies._kernels import atr_wilder, ema, rolling_mean, rsi_wilder
+
+# Struct-of-arrays view of a price frame passed to the indicator kernels
+OHLCV = namedtuple('OHLCV', 'open high low close volume')
+
+# Period patterns for indicator specs such as "SMA(50), SMA(200)"
+PERIOD_PATTERNS = {
+    name: re.compile(rf'{name}\((\d+)\)')
+    for name in ('SMA', 'EMA', 'RSI', 'ATR')
+}
 
 
 class StrategyBase(ABC):
@@ -50,6 +62,11 @@ class StrategyBase(ABC):
         self.position_sizing = strategy_def.get('position_sizing_rules', {})
         self.params_to_optimize = strategy_def.get('parameters_to_optimize', [])
         
+        # Indicator specs parsed once into (name, period) pairs
+        self._parsed_indicators = self._parse_indicators(
+            self.required_data.get('indicators', [])
+        )
+        
     def calculate_indicators(self, df):
         """
         Calculate all required indicators for the strategy
@@ -60,75 +77,93 @@ class StrategyBase(ABC):
         Returns:
             DataFrame with indicators added
         """
-        df = df.copy()
-        
-        # Extract indicator requirements from strategy definition
-        indicators = self.required_data.get('indicators', [])
-        
-        for indicator_spec in indicators:
-            # Parse indicator string (e.g., "SMA(200)")
-            if 'SMA' in str(indicator_spec):
-                periods = self._extract_periods(indicator_spec, 'SMA')
-                for period in periods:
-                    df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
-                    
-            if 'EMA' in str(indicator_spec):
-                periods = self._extract_periods(indicator_spec, 'EMA')
-                for period in periods:
-                    df[f'ema_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
-                    
-            if 'RSI' in str(indicator_spec):
-                periods = self._extract_periods(indicator_spec, 'RSI')
-                for period in periods:
-                    df[f'rsi_{period}'] = self._calculate_rsi(df['close'], period)
-                    
-            if 'ATR' in str(indicator_spec):
-                periods = self._extract_periods(indicator_spec, 'ATR')
-                for period in periods:
-                    df[f'atr_{period}'] = self._calculate_atr(df, period)
-                    
-            if 'MACD' in str(indicator_spec):
-                df = self._calculate_macd(df)
+        # astype returns a new frame, so the caller's data is left untouched
+        df = self._to_float32(df)
+        bars = self._ohlcv(df)
+        
+        for name, period in self._parsed_indicators:
+            if name == 'SMA':
+                df[f'sma_{period}'] = self._sma(bars.close, period)
+            elif name == 'EMA':
+                df[f'ema_{period}'] = ema(bars.close, period)
+            elif name == 'RSI':
+                df[f'rsi_{period}'] = rsi_wilder(bars.close, period)
+            elif name == 'ATR':
+                df[f'atr_{period}'] = self._atr(bars, period)
+            elif name == 'MACD':
+                df['macd'], df['macd_signal'], df['macd_hist'] = self._macd(bars.close)
         
         return df
     
-    def _extract_periods(self, indicator_spec, indicator_name):
-        """Extract period numbers from indicator specification"""
-        import re
-        pattern = f'{indicator_name}\\((\\d+)\\)'
-        matches = re.findall(pattern, str(indicator_spec))
-        return [int(m) for m in matches]
+    def _parse_indicators(self, indicator_specs):
+        """
+        Parse indicator specs (e.g. "SMA(50), SMA(200) ...") into (name, period) pairs
+        
+        MACD uses its default periods, so its pair has period None.
+        """
+        parsed = []
+        
+        for indicator_spec in indicator_specs:
+            spec = str(indicator_spec)
+            
+            for name, pattern in PERIOD_PATTERNS.items():
+                parsed.extend((name, int(period)) for period in pattern.findall(spec))
+            
+            if 'MACD' in spec:
+                parsed.append(('MACD', None))
+        
+        return parsed
     
     def _calculate_rsi(self, series, period=14):
-        """Calculate RSI indicator"""
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        """Calculate RSI indicator (Wilder smoothing)"""
+        return pd.Series(rsi_wilder(series.to_numpy(), period), index=series.index)
     
     def _calculate_atr(self, df, period=14):
-        """Calculate Average True Range"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(window=period).mean()
+        """Calculate Average True Range (Wilder smoothing)"""
+        return pd.Series(self._atr(self._ohlcv(df), period), index=df.index)
     
     def _calculate_macd(self, df, fast=12, slow=26, signal=9):
         """Calculate MACD indicator"""
-        ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
-        df['macd'] = ema_fast - ema_slow
-        df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        df['macd'], df['macd_signal'], df['macd_hist'] = self._macd(
+            self._ohlcv(df).close, fast, slow, signal
+        )
         return df
     
+    def _to_float32(self, df):
+        """Downcast OHLC columns to float32 to halve memory traffic in rolling/ewm"""
+        return df.astype({col: 'float32' for col in ('open', 'high', 'low', 'close') if col in df})
+    
+    def _ohlcv(self, df):
+        """
+        OHLCV columns as contiguous arrays for the kernels
+        
+        Prices are float32, which halves the bytes each kernel streams (no
+        copy when the frame went through _to_float32). Volume stays float64:
+        share counts can exceed int32 and lose precision in float32.
+        Missing columns are None. Build it once per calculate_indicators
+        and pass it (or its arrays) to _sma/_atr/_macd.
+        """
+        prices = [
+            df[col].to_numpy(dtype=np.float32) if col in df else None
+            for col in ('open', 'high', 'low', 'close')
+        ]
+        volume = df['volume'].to_numpy(dtype=np.float64) if 'volume' in df else None
+        return OHLCV(*prices, volume)
+    
+    def _sma(self, close, period):
+        """SMA of a close array"""
+        return rolling_mean(close, period)
+    
+    def _atr(self, bars, period=14):
+        """ATR of an OHLCV struct as an array"""
+        return atr_wilder(bars.high, bars.low, bars.close, period)
+    
+    def _macd(self, close, fast=12, slow=26, signal=9):
+        """MACD line, signal line and histogram of a close array"""
+        macd = ema(close, fast) - ema(close, slow)
+        macd_signal = ema(macd, signal)
+        return macd, macd_signal, macd - macd_signal
+    
     @abstractmethod
     def generate_signals(self, df):
         """
@@ -143,6 +178,33 @@ class StrategyBase(ABC):
         """
         pass
     
+    def check_batch(self, data_dict):
+        """
+        Check the most recent bar of many symbols in one call
+        
+        The default checks each symbol in turn; strategies with a cheap
+        vectorized screen override this. A symbol whose data can't be
+        processed is skipped without affecting the others.
+        
+        Args:
+            data_dict: Dict of {symbol: DataFrame}
+            
+        Returns:
+            List of signals
+        """
+        signals = []
+        
+        for symbol, df in data_dict.items():
+            try:
+                signal = self.check_current_signal(df)
+            except Exception:
+                continue
+            
+            if signal:
+                signals.append(signal)
+        
+        return signals
+    
     def calculate_position_size(self, entry_price, stop_price, account_equity):
         """
         Calculate position size based on risk parameters
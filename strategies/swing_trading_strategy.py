@@ -10,13 +10,24 @@ import numpy as np
 import sys
 from pathlib import Path
 
+try:
+    import numexpr as ne
+except ImportError:  # fall back to numpy boolean ops
+    ne = None
+
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from strategies.strategy_base import StrategyBase
+from strategies._kernels import ema, rsi_wilder
 from strategies.strategy_definitions import STRATEGIES
 
 
+# Entry pattern masks, evaluated by numexpr straight into preallocated arrays
+CROSS_ABOVE = '(fast_prev <= slow_prev) & (fast > slow)'
+MA_DIP = '(low <= ma) & (close > ma) & (close_prev > ma_prev)'
+
+
 class SwingTradingStrategy(StrategyBase):
     """
     Swing Trading Strategy with multiple entry patterns
@@ -29,6 +40,9 @@ class SwingTradingStrategy(StrategyBase):
     Exit: EMA cross down, close below MA, or RSI profit-taking
     """
     
+    # Categories of the entry_type column, indexed by pattern code (0 = no signal)
+    ENTRY_TYPES = ['', 'crossover', 'dip_50', 'dip_200']
+    
     def __init__(self, config=None):
         strategy_def = STRATEGIES['ultimate_guide_swing_trading_burns_2021_trend_variant']
         super().__init__(strategy_def, config)
@@ -44,91 +58,144 @@ class SwingTradingStrategy(StrategyBase):
         
         # Entry mode: 'crossover', 'dip_50', 'dip_200', 'all'
         self.entry_mode = config.get('entry_mode', 'all') if config else 'all'
+        
+        # Categories of the reason column, indexed like ENTRY_TYPES
+        self.reasons = [
+            '',
+            f'EMA {self.fast_ema}/{self.slow_ema} bullish cross',
+            '50-day MA dip-buy (bounce)',
+            '200-day MA deep dip-buy'
+        ]
     
     def calculate_indicators(self, df):
         """Calculate EMAs, SMAs, RSI, ATR"""
-        df = df.copy()
+        # astype returns a new frame, so the caller's data is left untouched
+        df = self._to_float32(df)
+        out = {}
+        
+        bars = self._ohlcv(df)
+        close = bars.close
         
         # EMAs for crossover
-        df[f'ema_{self.fast_ema}'] = df['close'].ewm(span=self.fast_ema, adjust=False).mean()
-        df[f'ema_{self.slow_ema}'] = df['close'].ewm(span=self.slow_ema, adjust=False).mean()
+        out[f'ema_{self.fast_ema}'] = ema(close, self.fast_ema)
+        out[f'ema_{self.slow_ema}'] = ema(close, self.slow_ema)
         
         # SMAs for dip-buying
-        df[f'sma_{self.ma_50}'] = df['close'].rolling(window=self.ma_50).mean()
-        df[f'sma_{self.ma_200}'] = df['close'].rolling(window=self.ma_200).mean()
+        out[f'sma_{self.ma_50}'] = self._sma(close, self.ma_50)
+        out[f'sma_{self.ma_200}'] = self._sma(close, self.ma_200)
         
         # RSI for profit-taking
-        df[f'rsi_{self.rsi_period}'] = self._calculate_rsi(df['close'], self.rsi_period)
+        out[f'rsi_{self.rsi_period}'] = rsi_wilder(close, self.rsi_period)
         
         # ATR for sizing
-        df[f'atr_{self.atr_period}'] = self._calculate_atr(df, self.atr_period)
+        out[f'atr_{self.atr_period}'] = self._atr(bars, self.atr_period)
         
-        return df
+        # Attach all new columns at once (assign leaves the caller's frame untouched)
+        return df.assign(**out)
+    
+    def _min_bars(self):
+        """Fewest bars on which an active entry pattern can signal"""
+        # Each pattern compares against the previous bar, and the dips need
+        # their MA defined on it
+        required = {
+            'crossover': 2,
+            'dip_50': self.ma_50 + 1,
+            'dip_200': self.ma_200 + 1
+        }
+        
+        if self.entry_mode == 'all':
+            return min(required.values())
+        return required.get(self.entry_mode, 0)
     
     def generate_signals(self, df):
         """Generate swing trading signals"""
-        df = self.calculate_indicators(df)
+        # Too short for any active pattern to be defined: nothing can signal
+        if len(df) < self._min_bars():
+            code = np.zeros(len(df), dtype=np.int8)
+            return df.assign(
+                signal=code,
+                entry_price=np.nan,
+                stop_price=np.nan,
+                reason=pd.Categorical.from_codes(code, self.reasons),
+                entry_type=pd.Categorical.from_codes(code, self.ENTRY_TYPES)
+            )
         
-        df['signal'] = 0
-        df['entry_price'] = np.nan
-        df['stop_price'] = np.nan
-        df['reason'] = ''
-        df['entry_type'] = ''
+        df = self.calculate_indicators(df)
         
         fast_col = f'ema_{self.fast_ema}'
         slow_col = f'ema_{self.slow_ema}'
         ma50_col = f'sma_{self.ma_50}'
         ma200_col = f'sma_{self.ma_200}'
         
+        # Previous-bar comparisons slice the raw arrays ([1:] vs [:-1]);
+        # the first bar has no previous bar and never signals
+        close = df['close'].to_numpy()
+        low = df['low'].to_numpy()
+        
+        # Active entry patterns in priority order: (code, mask, stop)
+        patterns = []
+        
         # ENTRY PATTERN 1: EMA Crossover
         if self.entry_mode in ['crossover', 'all']:
-            cross_above = (
-                (df[fast_col].shift(1) <= df[slow_col].shift(1)) &
-                (df[fast_col] > df[slow_col])
-            )
+            fast = df[fast_col].to_numpy()
+            slow = df[slow_col].to_numpy()
+            
+            cross_above = np.zeros(len(df), dtype=bool)
+            if ne is not None:
+                ne.evaluate(CROSS_ABOVE, local_dict={
+                    'fast_prev': fast[:-1], 'slow_prev': slow[:-1], 'fast': fast[1:], 'slow': slow[1:]
+                }, out=cross_above[1:])
+            else:
+                cross_above[1:] = (fast[:-1] <= slow[:-1]) & (fast[1:] > slow[1:])
             
-            df.loc[cross_above, 'signal'] = 1
-            df.loc[cross_above, 'entry_price'] = df.loc[cross_above, 'close']
-            df.loc[cross_above, 'stop_price'] = df.loc[cross_above, slow_col]
-            df.loc[cross_above, 'reason'] = f'EMA {self.fast_ema}/{self.slow_ema} bullish cross'
-            df.loc[cross_above, 'entry_type'] = 'crossover'
+            patterns.append((1, cross_above, slow))
         
         # ENTRY PATTERN 2: 50-day MA Dip-Buy
         if self.entry_mode in ['dip_50', 'all']:
-            # Price touches or crosses below 50-MA but closes above it
-            dip_50 = (
-                (df['low'] <= df[ma50_col]) &
-                (df['close'] > df[ma50_col]) &
-                (df['close'].shift(1) > df[ma50_col].shift(1))  # Was above yesterday
-            )
-            
-            # Only mark if not already signaled by crossover
-            new_dip_50 = dip_50 & (df['signal'] == 0)
+            ma50 = df[ma50_col].to_numpy()
             
-            df.loc[new_dip_50, 'signal'] = 1
-            df.loc[new_dip_50, 'entry_price'] = df.loc[new_dip_50, 'close']
-            df.loc[new_dip_50, 'stop_price'] = df.loc[new_dip_50, ma50_col] * 0.98  # 2% below
-            df.loc[new_dip_50, 'reason'] = '50-day MA dip-buy (bounce)'
-            df.loc[new_dip_50, 'entry_type'] = 'dip_50'
+            patterns.append((2, self._ma_dip(low, close, ma50), ma50 * 0.98))  # 2% below
         
         # ENTRY PATTERN 3: 200-day MA Dip-Buy (Deep Pullback)
         if self.entry_mode in ['dip_200', 'all']:
-            dip_200 = (
-                (df['low'] <= df[ma200_col]) &
-                (df['close'] > df[ma200_col]) &
-                (df['close'].shift(1) > df[ma200_col].shift(1))
-            )
-            
-            new_dip_200 = dip_200 & (df['signal'] == 0)
+            ma200 = df[ma200_col].to_numpy()
             
-            df.loc[new_dip_200, 'signal'] = 1
-            df.loc[new_dip_200, 'entry_price'] = df.loc[new_dip_200, 'close']
-            df.loc[new_dip_200, 'stop_price'] = df.loc[new_dip_200, ma200_col] * 0.97  # 3% below
-            df.loc[new_dip_200, 'reason'] = '200-day MA deep dip-buy'
-            df.loc[new_dip_200, 'entry_type'] = 'dip_200'
+            patterns.append((3, self._ma_dip(low, close, ma200), ma200 * 0.97))  # 3% below
+        
+        # Earlier patterns win: code is the first matching pattern's code
+        # per bar, 0 where none match
+        masks = [pattern[1] for pattern in patterns]
+        code = np.zeros(len(df), dtype=np.int8)
+        if patterns:
+            code = np.select(masks, [pattern[0] for pattern in patterns], 0).astype(np.int8)
+        
+        signal = code > 0
+        df['signal'] = signal.astype(np.int8)
+        df['entry_price'] = np.where(signal, close, np.nan)
+        df['stop_price'] = np.select(masks, [pattern[2] for pattern in patterns], np.nan) if patterns else np.nan
+        df['reason'] = pd.Categorical.from_codes(code, self.reasons)
+        df['entry_type'] = pd.Categorical.from_codes(code, self.ENTRY_TYPES)
         
         return df
     
+    def _ma_dip(self, low, close, ma):
+        """Bars whose low touches the MA but close above it, after closing above it the bar before"""
+        dip = np.zeros(len(close), dtype=bool)
+        
+        if ne is not None:
+            ne.evaluate(MA_DIP, local_dict={
+                'low': low[1:], 'close': close[1:], 'ma': ma[1:],
+                'close_prev': close[:-1], 'ma_prev': ma[:-1]
+            }, out=dip[1:])
+        else:
+            dip[1:] = (
+                (low[1:] <= ma[1:]) &
+                (close[1:] > ma[1:]) &
+                (close[:-1] > ma[:-1])  # Was above yesterday
+            )
+        
+        return dip
+    
     def check_current_signal(self, df):
         """Check for signal on most recent bar"""
         df = self.generate_signals(df)
@@ -136,21 +203,24 @@ class SwingTradingStrategy(StrategyBase):
         if df.empty:
             return None
         
-        latest = df.iloc[-1]
-        
-        if latest['signal'] == 1:
+        # Read the last bar straight from the column arrays instead of
+        # materializing a row Series
+        if df['signal'].to_numpy()[-1] == 1:
+            entry_price = df['entry_price'].to_numpy()[-1]
+            stop_price = df['stop_price'].to_numpy()[-1]
+            
             return {
-                'symbol': latest.get('symbol', 'Unknown'),
-                'date': latest.name,
+                'symbol': df['symbol'].iat[0] if 'symbol' in df else 'Unknown',
+                'date': df.index[-1],
                 'signal': 'LONG',
-                'entry_price': latest['entry_price'],
-                'stop_price': latest['stop_price'],
-                'reason': latest['reason'],
-                'entry_type': latest['entry_type'],
+                'entry_price': entry_price,
+                'stop_price': stop_price,
+                'reason': df['reason'].iat[-1],
+                'entry_type': df['entry_type'].iat[-1],
                 'strategy': self.name,
-                'risk_per_share': latest['entry_price'] - latest['stop_price'],
-                'atr': latest.get(f'atr_{self.atr_period}', 0),
-                'rsi': latest.get(f'rsi_{self.rsi_period}', 50)
+                'risk_per_share': entry_price - stop_price,
+                'atr': df[f'atr_{self.atr_period}'].to_numpy()[-1],
+                'rsi': df[f'rsi_{self.rsi_period}'].to_numpy()[-1]
             }
         
         return None